@@ -307,16 +307,18 @@ def setup(
     payload[0x26] = 0x14  # This seems to always be set to 14
     # Add the SSID to the payload
     ssid_start = 68
-    ssid_length = 0
-    for letter in ssid:
-        payload[(ssid_start + ssid_length)] = ord(letter)
-        ssid_length += 1
+    ssid_data = ssid.encode("latin-1")
+    ssid_length = len(ssid_data)
+    if ssid_length > 32:
+        raise ValueError("SSID must be at most 32 characters long")
+    payload[ssid_start:ssid_start+ssid_length] = ssid_data
     # Add the WiFi password to the payload
     pass_start = 100
-    pass_length = 0
-    for letter in password:
-        payload[(pass_start + pass_length)] = ord(letter)
-        pass_length += 1
+    pass_data = password.encode("latin-1")
+    pass_length = len(pass_data)
+    if pass_length > 32:
+        raise ValueError("Password must be at most 32 characters long")
+    payload[pass_start:pass_start+pass_length] = pass_data
 
     payload[0x84] = ssid_length  # Character length of SSID
     payload[0x85] = pass_length  # Character length of password
@@ -7,6 +7,8 @@ from . import exceptions as e
 from .device import Device
 from .helpers import CRC16
 
+_HVAC_HEADER = struct.Struct("<HHHHH")
+
 
 class hysen(Device):
     """Controls a Hysen heating thermostat.
@@ -317,9 +319,7 @@ class hvac(Device):
         """Encode data for transport."""
         packet = bytearray(10)
         p_len = 10 + len(data)
-        struct.pack_into(
-            "<HHHHH", packet, 0, p_len, 0x00BB, 0x8006, 0, len(data)
-        )
+        _HVAC_HEADER.pack_into(packet, 0, p_len, 0x00BB, 0x8006, 0, len(data))
         packet += data
         crc = CRC16.calculate(packet[0x02:], polynomial=0x9BE4)
         packet += crc.to_bytes(2, "little")
@@ -48,7 +48,7 @@ def scan(
     packet[0x20:0x22] = checksum.to_bytes(2, "little")
 
     start_time = time.time()
-    discovered = []
+    discovered = set()
 
     try:
         while (time.time() - start_time) < timeout:
@@ -67,7 +67,7 @@ def scan(
 
                 if (host, mac, devtype) in discovered:
                     continue
-                discovered.append((host, mac, devtype))
+                discovered.add((host, mac, devtype))
 
                 name = resp[0x40:].split(b"\x00")[0].decode()
                 is_locked = bool(resp[0x7F])
@@ -1,5 +1,31 @@
 """Helper functions and classes."""
-from typing import Dict, List, Sequence
+import json
+from typing import Any, Dict, List, Sequence
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize an object to compact JSON.
+
+    orjson is used if it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def json_loads(data: bytes) -> Any:
+    """Deserialize JSON data.
+
+    orjson is used if it is installed.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 class CRC16:
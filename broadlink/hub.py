@@ -1,10 +1,10 @@
 """Support for hubs."""
 import struct
-import json
 from typing import Optional
 
 from . import exceptions as e
 from .device import Device
+from .helpers import json_dumps, json_loads
 
 
 class s3(Device):
@@ -66,11 +66,11 @@ class s3(Device):
         if did is not None:
             state["did"] = did
         if pwr1 is not None:
-            state["pwr1"] = int(bool(pwr1))
+            state["pwr1"] = 1 if pwr1 else 0
         if pwr2 is not None:
-            state["pwr2"] = int(bool(pwr2))
+            state["pwr2"] = 1 if pwr2 else 0
         if pwr3 is not None:
-            state["pwr3"] = int(bool(pwr3))
+            state["pwr3"] = 1 if pwr3 else 0
 
         packet = self._encode(2, state)
         response = self.send_packet(0x6A, packet)
@@ -81,7 +81,7 @@ class s3(Device):
         """Encode a JSON packet."""
         # flag: 1 for reading, 2 for writing.
         packet = bytearray(12)
-        data = json.dumps(state, separators=(",", ":")).encode()
+        data = json_dumps(state)
         struct.pack_into(
             "<HHHBBI", packet, 0, 0xA5A5, 0x5A5A, 0, flag, 0x0B, len(data)
         )
@@ -94,5 +94,5 @@ class s3(Device):
         """Decode a JSON packet."""
         payload = self.decrypt(response[0x38:])
         js_len = struct.unpack_from("<I", payload, 0x08)[0]
-        state = json.loads(payload[0x0C:0x0C+js_len])
+        state = json_loads(payload[0x0C:0x0C+js_len])
         return state
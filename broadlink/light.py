@@ -1,11 +1,11 @@
 """Support for lights."""
 import enum
-import json
 import struct
 from typing import Optional
 
 from . import exceptions as e
 from .device import Device
+from .helpers import json_dumps, json_loads
 
 
 class lb1(Device):
@@ -51,7 +51,7 @@ class lb1(Device):
         """Set the power state of the device."""
         state = {}
         if pwr is not None:
-            state["pwr"] = int(bool(pwr))
+            state["pwr"] = 1 if pwr else 0
         if red is not None:
             state["red"] = int(red)
         if blue is not None:
@@ -88,7 +88,7 @@ class lb1(Device):
         """Encode a JSON packet."""
         # flag: 1 for reading, 2 for writing.
         packet = bytearray(14)
-        data = json.dumps(state, separators=(",", ":")).encode()
+        data = json_dumps(state)
         p_len = 12 + len(data)
         struct.pack_into(
             "<HHHHBBI", packet, 0, p_len, 0xA5A5, 0x5A5A, 0, flag, 0x0B, len(data)
@@ -102,7 +102,7 @@ class lb1(Device):
         """Decode a JSON packet."""
         payload = self.decrypt(response[0x38:])
         js_len = struct.unpack_from("<I", payload, 0xA)[0]
-        state = json.loads(payload[0xE:0xE+js_len])
+        state = json_loads(payload[0xE:0xE+js_len])
         return state
 
 
@@ -148,7 +148,7 @@ class lb2(Device):
         """Set the power state of the device."""
         state = {}
         if pwr is not None:
-            state["pwr"] = int(bool(pwr))
+            state["pwr"] = 1 if pwr else 0
         if red is not None:
             state["red"] = int(red)
         if blue is not None:
@@ -183,7 +183,7 @@ class lb2(Device):
         """Encode a JSON packet."""
         # flag: 1 for reading, 2 for writing.
         packet = bytearray(12)
-        data = json.dumps(state, separators=(",", ":")).encode()
+        data = json_dumps(state)
         struct.pack_into(
             "<HHHBBI", packet, 0, 0xA5A5, 0x5A5A, 0, flag, 0x0B, len(data)
         )
@@ -196,5 +196,5 @@ class lb2(Device):
         """Decode a JSON packet."""
         payload = self.decrypt(response[0x38:])
         js_len = struct.unpack_from("<I", payload, 0x08)[0]
-        state = json.loads(payload[0x0C:0x0C+js_len])
+        state = json_loads(payload[0x0C:0x0C+js_len])
         return state
@@ -1,10 +1,34 @@
 """Support for switches."""
 import json
 import struct
-from typing import Optional
+import time
+from typing import Optional, Tuple
 
 from . import exceptions as e
 from .device import Device
+from .helpers import json_dumps, json_loads
+
+_SP4_HEADER = struct.Struct("<HHHBBI")
+_SP4B_HEADER = struct.Struct("<HHHHBBI")
+_UINT32 = struct.Struct("<I")
+
+_SP2_GET_STATE = bytes([1]) + bytes(15)
+_SP2S_GET_ENERGY = bytes([4]) + bytes(15)
+_SP3S_GET_ENERGY = bytes([8, 0, 254, 1, 5, 1, 0, 0, 0, 45])
+
+_MP1_SET_POWER = bytes.fromhex("0d00a5a55a5a00c00200030000000000")
+_MP1_CHECK_POWER = bytes.fromhex("0a00a5a55a5aaec00100000000000000")
+_MP1S_GET_STATE = bytes.fromhex("0e00a5a55a5ab2c00100040000000000")
+
+_MP1_STATES = tuple(
+    {"s1": bool(i & 1), "s2": bool(i & 2), "s3": bool(i & 4), "s4": bool(i & 8)}
+    for i in range(16)
+)
+
+
+def _bcd(value: int) -> int:
+    """Decode a packed BCD byte."""
+    return (value >> 4) * 10 + (value & 0x0F)
 
 
 class sp1(Device):
@@ -35,9 +59,7 @@ class sp2(Device):
 
     def check_power(self) -> bool:
         """Return the power state of the device."""
-        packet = bytearray(16)
-        packet[0] = 1
-        response = self.send_packet(0x6A, packet)
+        response = self.send_packet(0x6A, _SP2_GET_STATE)
         e.check_error(response[0x22:0x24])
         payload = self.decrypt(response[0x38:])
         return bool(payload[0x4])
@@ -50,12 +72,10 @@ class sp2s(sp2):
 
     def get_energy(self) -> float:
         """Return the power consumption in W."""
-        packet = bytearray(16)
-        packet[0] = 4
-        response = self.send_packet(0x6A, packet)
+        response = self.send_packet(0x6A, _SP2S_GET_ENERGY)
         e.check_error(response[0x22:0x24])
         payload = self.decrypt(response[0x38:])
-        return int.from_bytes(payload[0x4:0x7], "little") / 1000
+        return (_UINT32.unpack_from(payload, 0x4)[0] & 0xFFFFFF) / 1000
 
 
 class sp3(Device):
@@ -63,39 +83,56 @@ class sp3(Device):
 
     TYPE = "SP3"
 
+    # Last known state byte and the monotonic time it was seen at.
+    _status: Optional[Tuple[int, float]] = None
+
     def set_power(self, pwr: bool) -> None:
         """Set the power state of the device."""
         packet = bytearray(16)
         packet[0] = 2
-        packet[4] = self.check_nightlight() << 1 | bool(pwr)
+        packet[4] = self._status_byte(max_age=0.5) & 2 | bool(pwr)
         response = self.send_packet(0x6A, packet)
         e.check_error(response[0x22:0x24])
+        self._status = (packet[4], time.monotonic())
 
     def set_nightlight(self, ntlight: bool) -> None:
         """Set the night light state of the device."""
         packet = bytearray(16)
         packet[0] = 2
-        packet[4] = bool(ntlight) << 1 | self.check_power()
+        packet[4] = bool(ntlight) << 1 | self._status_byte(max_age=0.5) & 1
         response = self.send_packet(0x6A, packet)
         e.check_error(response[0x22:0x24])
+        self._status = (packet[4], time.monotonic())
 
     def check_power(self) -> bool:
         """Return the power state of the device."""
-        packet = bytearray(16)
-        packet[0] = 1
-        response = self.send_packet(0x6A, packet)
-        e.check_error(response[0x22:0x24])
-        payload = self.decrypt(response[0x38:])
-        return bool(payload[0x4] & 1)
+        return bool(self._status_byte() & 1)
 
     def check_nightlight(self) -> bool:
         """Return the state of the night light."""
-        packet = bytearray(16)
-        packet[0] = 1
-        response = self.send_packet(0x6A, packet)
+        return bool(self._status_byte() & 2)
+
+    def get_state(self) -> dict:
+        """Return the power and night light states in a single request."""
+        data = self._status_byte()
+        return {"pwr": bool(data & 1), "ntlight": bool(data & 2)}
+
+    def _status_byte(self, max_age: float = 0.0) -> int:
+        """Return the raw state byte of the device.
+
+        A state byte seen less than `max_age` seconds ago is reused
+        instead of querying the device again.
+        """
+        if self._status is not None:
+            data, timestamp = self._status
+            if time.monotonic() - timestamp < max_age:
+                return data
+
+        response = self.send_packet(0x6A, _SP2_GET_STATE)
         e.check_error(response[0x22:0x24])
         payload = self.decrypt(response[0x38:])
-        return bool(payload[0x4] & 2)
+        self._status = (payload[0x4], time.monotonic())
+        return payload[0x4]
 
 
 class sp3s(sp2):
@@ -105,12 +142,13 @@ class sp3s(sp2):
 
     def get_energy(self) -> float:
         """Return the power consumption in W."""
-        packet = bytearray([8, 0, 254, 1, 5, 1, 0, 0, 0, 45])
-        response = self.send_packet(0x6A, packet)
+        response = self.send_packet(0x6A, _SP3S_GET_ENERGY)
         e.check_error(response[0x22:0x24])
         payload = self.decrypt(response[0x38:])
-        energy = payload[0x7:0x4:-1].hex()
-        return int(energy) / 100
+        energy = (
+            _bcd(payload[0x7]) * 10000 + _bcd(payload[0x6]) * 100 + _bcd(payload[0x5])
+        )
+        return energy / 100
 
 
 class sp4(Device):
@@ -118,6 +156,11 @@ class sp4(Device):
 
     TYPE = "SP4"
 
+    # Last state read from the device and the monotonic time it was read at.
+    _state: Optional[Tuple[dict, float]] = None
+    # Encoded get_state() request, built on first use.
+    _get_state_packet: Optional[bytes] = None
+
     def set_power(self, pwr: bool) -> None:
         """Set the power state of the device."""
         self.set_state(pwr=pwr)
@@ -138,44 +181,59 @@ class sp4(Device):
         """Set state of device."""
         state = {}
         if pwr is not None:
-            state["pwr"] = int(bool(pwr))
+            state["pwr"] = 1 if pwr else 0
         if ntlight is not None:
-            state["ntlight"] = int(bool(ntlight))
+            state["ntlight"] = 1 if ntlight else 0
         if indicator is not None:
-            state["indicator"] = int(bool(indicator))
+            state["indicator"] = 1 if indicator else 0
         if ntlbrightness is not None:
             state["ntlbrightness"] = ntlbrightness
         if maxworktime is not None:
             state["maxworktime"] = maxworktime
         if childlock is not None:
-            state["childlock"] = int(bool(childlock))
+            state["childlock"] = 1 if childlock else 0
 
+        self._state = None
         packet = self._encode(2, state)
         response = self.send_packet(0x6A, packet)
         return self._decode(response)
 
     def check_power(self) -> bool:
         """Return the power state of the device."""
-        state = self.get_state()
+        state = self._recent_state(max_age=0.25)
         return bool(state["pwr"])
 
     def check_nightlight(self) -> bool:
         """Return the state of the night light."""
-        state = self.get_state()
+        state = self._recent_state(max_age=0.25)
         return bool(state["ntlight"])
 
     def get_state(self) -> dict:
         """Get full state of device."""
-        packet = self._encode(1, {})
-        response = self.send_packet(0x6A, packet)
-        return self._decode(response)
+        if self._get_state_packet is None:
+            self._get_state_packet = bytes(self._encode(1, {}))
+        response = self.send_packet(0x6A, self._get_state_packet)
+        state = self._decode(response)
+        self._state = (dict(state), time.monotonic())
+        return state
+
+    def _recent_state(self, max_age: float) -> dict:
+        """Return a state read less than `max_age` seconds ago.
+
+        The device is queried again if there is no such state.
+        """
+        if self._state is not None:
+            state, timestamp = self._state
+            if time.monotonic() - timestamp < max_age:
+                return state
+        return self.get_state()
 
     def _encode(self, flag: int, state: dict) -> bytes:
         """Encode a message."""
         packet = bytearray(12)
-        data = json.dumps(state, separators=(",", ":")).encode()
-        struct.pack_into(
-            "<HHHBBI", packet, 0, 0xA5A5, 0x5A5A, 0x0000, flag, 0x0B, len(data)
+        data = json_dumps(state)
+        _SP4_HEADER.pack_into(
+            packet, 0, 0xA5A5, 0x5A5A, 0x0000, flag, 0x0B, len(data)
         )
         packet.extend(data)
         checksum = sum(packet, 0xBEAF) & 0xFFFF
@@ -186,8 +244,8 @@ class sp4(Device):
         """Decode a message."""
         e.check_error(response[0x22:0x24])
         payload = self.decrypt(response[0x38:])
-        js_len = struct.unpack_from("<I", payload, 0x08)[0]
-        state = json.loads(payload[0x0C:0x0C+js_len])
+        js_len = _UINT32.unpack_from(payload, 0x08)[0]
+        state = json_loads(payload[0x0C:0x0C+js_len])
         return state
 
 
@@ -211,10 +269,9 @@ class sp4b(sp4):
     def _encode(self, flag: int, state: dict) -> bytes:
         """Encode a message."""
         packet = bytearray(14)
-        data = json.dumps(state, separators=(",", ":")).encode()
+        data = json_dumps(state)
         length = 12 + len(data)
-        struct.pack_into(
-            "<HHHHBBI",
+        _SP4B_HEADER.pack_into(
             packet,
             0,
             length,
@@ -226,7 +283,7 @@ class sp4b(sp4):
             len(data),
         )
         packet.extend(data)
-        checksum = sum(packet[0x02:], 0xBEAF) & 0xFFFF
+        checksum = sum(memoryview(packet)[0x02:], 0xBEAF) & 0xFFFF
         packet[0x06:0x08] = checksum.to_bytes(2, "little")
         return packet
 
@@ -234,8 +291,8 @@ class sp4b(sp4):
         """Decode a message."""
         e.check_error(response[0x22:0x24])
         payload = self.decrypt(response[0x38:])
-        js_len = struct.unpack_from("<I", payload, 0xA)[0]
-        state = json.loads(payload[0x0E:0x0E+js_len])
+        js_len = _UINT32.unpack_from(payload, 0x0A)[0]
+        state = json_loads(payload[0x0E:0x0E+js_len])
         return state
 
 
@@ -244,13 +301,17 @@ class bg1(Device):
 
     TYPE = "BG1"
 
+    # Encoded get_state() request, built on first use.
+    _get_state_packet: Optional[bytes] = None
+
     def get_state(self) -> dict:
         """Return the power state of the device.
 
         Example: `{"pwr":1,"pwr1":1,"pwr2":0,"maxworktime":60,"maxworktime1":60,"maxworktime2":0,"idcbrightness":50}`
         """
-        packet = self._encode(1, {})
-        response = self.send_packet(0x6A, packet)
+        if self._get_state_packet is None:
+            self._get_state_packet = bytes(self._encode(1, {}))
+        response = self.send_packet(0x6A, self._get_state_packet)
         e.check_error(response[0x22:0x24])
         return self._decode(response)
 
@@ -267,11 +328,11 @@ class bg1(Device):
         """Set the power state of the device."""
         state = {}
         if pwr is not None:
-            state["pwr"] = int(bool(pwr))
+            state["pwr"] = 1 if pwr else 0
         if pwr1 is not None:
-            state["pwr1"] = int(bool(pwr1))
+            state["pwr1"] = 1 if pwr1 else 0
         if pwr2 is not None:
-            state["pwr2"] = int(bool(pwr2))
+            state["pwr2"] = 1 if pwr2 else 0
         if maxworktime is not None:
             state["maxworktime"] = maxworktime
         if maxworktime1 is not None:
@@ -281,6 +342,9 @@ class bg1(Device):
         if idcbrightness is not None:
             state["idcbrightness"] = idcbrightness
 
+        if not state:
+            return self.get_state()
+
         packet = self._encode(2, state)
         response = self.send_packet(0x6A, packet)
         e.check_error(response[0x22:0x24])
@@ -291,8 +355,7 @@ class bg1(Device):
         packet = bytearray(14)
         data = json.dumps(state).encode()
         length = 12 + len(data)
-        struct.pack_into(
-            "<HHHHBBI",
+        _SP4B_HEADER.pack_into(
             packet,
             0,
             length,
@@ -304,15 +367,15 @@ class bg1(Device):
             len(data),
         )
         packet.extend(data)
-        checksum = sum(packet[0x2:], 0xBEAF) & 0xFFFF
+        checksum = sum(memoryview(packet)[0x02:], 0xBEAF) & 0xFFFF
         packet[0x06:0x08] = checksum.to_bytes(2, "little")
         return packet
 
     def _decode(self, response: bytes) -> dict:
         """Decode a message."""
         payload = self.decrypt(response[0x38:])
-        js_len = struct.unpack_from("<I", payload, 0x0A)[0]
-        state = json.loads(payload[0x0E:0x0E+js_len])
+        js_len = _UINT32.unpack_from(payload, 0x0A)[0]
+        state = json_loads(payload[0x0E:0x0E+js_len])
         return state
 
 
@@ -340,13 +403,13 @@ class ehc31(bg1):
         """Set the power state of the device."""
         state = {}
         if pwr is not None:
-            state["pwr"] = int(bool(pwr))
+            state["pwr"] = 1 if pwr else 0
         if pwr1 is not None:
-            state["pwr1"] = int(bool(pwr1))
+            state["pwr1"] = 1 if pwr1 else 0
         if pwr2 is not None:
-            state["pwr2"] = int(bool(pwr2))
+            state["pwr2"] = 1 if pwr2 else 0
         if pwr3 is not None:
-            state["pwr3"] = int(bool(pwr3))
+            state["pwr3"] = 1 if pwr3 else 0
         if maxworktime1 is not None:
             state["maxworktime1"] = maxworktime1
         if maxworktime2 is not None:
@@ -356,15 +419,18 @@ class ehc31(bg1):
         if idcbrightness is not None:
             state["idcbrightness"] = idcbrightness
         if childlock is not None:
-            state["childlock"] = int(bool(childlock))
+            state["childlock"] = 1 if childlock else 0
         if childlock1 is not None:
-            state["childlock1"] = int(bool(childlock1))
+            state["childlock1"] = 1 if childlock1 else 0
         if childlock2 is not None:
-            state["childlock2"] = int(bool(childlock2))
+            state["childlock2"] = 1 if childlock2 else 0
         if childlock3 is not None:
-            state["childlock3"] = int(bool(childlock3))
+            state["childlock3"] = 1 if childlock3 else 0
         if childlock4 is not None:
-            state["childlock4"] = int(bool(childlock4))
+            state["childlock4"] = 1 if childlock4 else 0
+
+        if not state:
+            return self.get_state()
 
         packet = self._encode(2, state)
         response = self.send_packet(0x6A, packet)
@@ -379,16 +445,8 @@ class mp1(Device):
 
     def set_power_mask(self, sid_mask: int, pwr: bool) -> None:
         """Set the power state of the device."""
-        packet = bytearray(16)
-        packet[0x00] = 0x0D
-        packet[0x02] = 0xA5
-        packet[0x03] = 0xA5
-        packet[0x04] = 0x5A
-        packet[0x05] = 0x5A
+        packet = bytearray(_MP1_SET_POWER)
         packet[0x06] = 0xB2 + ((sid_mask << 1) if pwr else sid_mask)
-        packet[0x07] = 0xC0
-        packet[0x08] = 0x02
-        packet[0x0A] = 0x03
         packet[0x0D] = sid_mask
         packet[0x0E] = sid_mask if pwr else 0
 
@@ -402,17 +460,7 @@ class mp1(Device):
 
     def check_power_raw(self) -> int:
         """Return the power state of the device in raw format."""
-        packet = bytearray(16)
-        packet[0x00] = 0x0A
-        packet[0x02] = 0xA5
-        packet[0x03] = 0xA5
-        packet[0x04] = 0x5A
-        packet[0x05] = 0x5A
-        packet[0x06] = 0xAE
-        packet[0x07] = 0xC0
-        packet[0x08] = 0x01
-
-        response = self.send_packet(0x6A, packet)
+        response = self.send_packet(0x6A, _MP1_CHECK_POWER)
         e.check_error(response[0x22:0x24])
         payload = self.decrypt(response[0x38:])
         return payload[0x0E]
@@ -420,12 +468,7 @@ class mp1(Device):
     def check_power(self) -> dict:
         """Return the power state of the device."""
         data = self.check_power_raw()
-        return {
-            "s1": bool(data & 1),
-            "s2": bool(data & 2),
-            "s3": bool(data & 4),
-            "s4": bool(data & 8),
-        }
+        return dict(_MP1_STATES[data & 0x0F])
 
 
 class mp1s(mp1):
@@ -441,32 +484,20 @@ class mp1s(mp1):
         power in W.
         power consumption in kW·h.
         """
-        packet = bytearray(16)
-        packet[0x00] = 0x0E
-        packet[0x02] = 0xA5
-        packet[0x03] = 0xA5
-        packet[0x04] = 0x5A
-        packet[0x05] = 0x5A
-        packet[0x06] = 0xB2
-        packet[0x07] = 0xC0
-        packet[0x08] = 0x01
-        packet[0x0A] = 0x04
-
-        response = self.send_packet(0x6A, packet)
+        response = self.send_packet(0x6A, _MP1S_GET_STATE)
         e.check_error(response[0x22:0x24])
         payload = self.decrypt(response[0x38:])
-        payload_str = payload.hex()[4:-6]
 
         def get_value(start, end, factors):
             value = sum(
-                int(payload_str[i-2:i]) * factor
-                for i, factor in zip(range(start, end, -2), factors)
+                _bcd(payload[i]) * factor
+                for i, factor in zip(range(start, end, -1), factors)
             )
             return value
 
         return {
-            "volt": get_value(34, 30, [10, 0.1]),
-            "current": get_value(40, 34, [1, 0.01, 0.0001]),
-            "power": get_value(46, 40, [100, 1, 0.01]),
-            "totalconsum": get_value(54, 46, [10000, 100, 1, 0.01]),
+            "volt": get_value(0x12, 0x10, [10, 0.1]),
+            "current": get_value(0x15, 0x12, [1, 0.01, 0.0001]),
+            "power": get_value(0x18, 0x15, [100, 1, 0.01]),
+            "totalconsum": get_value(0x1C, 0x18, [10000, 100, 1, 0.01]),
         }
@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 
 
-from setuptools import setup, find_packages
+from setuptools import setup
 
 
 version = '0.19.0'
@@ -13,9 +13,10 @@ setup(
     author="Matthew Garrett",
     author_email="mjg59@srcf.ucam.org",
     url="http://github.com/mjg59/python-broadlink",
-    packages=find_packages(),
+    packages=["broadlink"],
     scripts=[],
     install_requires=["cryptography>=3.2"],
+    extras_require={"fast": ["orjson"]},
     description="Python API for controlling Broadlink devices",
     classifiers=[
         "Development Status :: 4 - Beta",